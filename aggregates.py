@@ -0,0 +1,321 @@
+import sys
+
+from sqlalchemy import text
+
+# --- ตารางสรุปยอดรายเดือน (rollup) ---
+# เก็บยอดรวมของ sales_transactions แยกตาม batch_id + ปี/เดือน + มิติที่ dashboard ใช้กรอง/จัดกลุ่ม
+# แยกตาม batch_id เพื่อให้เพิ่ม/ลบทีละ batch ได้ตรงๆ (ตอนอัปโหลด / ลบประวัติการอัปเดต)
+# add_batch / rebuild อัปเดตตาราง dimension (dim_*) ไปด้วย
+ROLLUP_TABLE = "sales_monthly_rollup"
+
+ROLLUP_DIMENSIONS = [
+    "sales_team", "sales_rep_name", "province",
+    "product_code", "product_group", "product_name",
+    "customer_code", "customer_name"
+]
+
+_DIMENSION_COLUMNS = ", ".join(ROLLUP_DIMENSIONS)
+
+_ROLLUP_SELECT = f"""
+    SELECT
+        batch_id,
+        EXTRACT(YEAR FROM document_date)::int AS doc_year,
+        EXTRACT(MONTH FROM document_date)::int AS doc_month,
+        {_DIMENSION_COLUMNS},
+        COALESCE(SUM(total_amount_non_vat), 0) AS total_amount,
+        COALESCE(SUM(quantity), 0) AS total_quantity,
+        COUNT(*) AS line_count
+    FROM sales_transactions
+    WHERE document_date IS NOT NULL {{batch_condition}}
+    GROUP BY batch_id, doc_year, doc_month, {_DIMENSION_COLUMNS}
+"""
+
+_ROLLUP_INSERT = f"""
+    INSERT INTO {ROLLUP_TABLE} (
+        batch_id, doc_year, doc_month, {_DIMENSION_COLUMNS},
+        total_amount, total_quantity, line_count
+    )
+"""
+
+
+# --- เวอร์ชันข้อมูล ---
+# เพิ่มทุกครั้งที่ rollup / dimension เปลี่ยน รวมถึงสคริปต์ที่รันนอกแอป (fix_etl.py, partitions.py detach, aggregates.py rebuild)
+# main.py ใช้คำนวณ ETag และเช็คเพื่อล้าง response cache ของทุก process
+DATA_VERSION_TABLE = "data_version"
+
+
+def init_data_version_table(conn):
+    conn.execute(text(f"""
+        CREATE TABLE IF NOT EXISTS {DATA_VERSION_TABLE} (
+            id SMALLINT PRIMARY KEY CHECK (id = 1),
+            version BIGINT NOT NULL DEFAULT 0,
+            updated_at TIMESTAMP DEFAULT NOW()
+        )
+    """))
+    conn.execute(text(f"INSERT INTO {DATA_VERSION_TABLE} (id) VALUES (1) ON CONFLICT (id) DO NOTHING"))
+
+
+def bump_data_version(conn):
+    return conn.execute(text(f"""
+        UPDATE {DATA_VERSION_TABLE} SET version = version + 1, updated_at = NOW()
+        WHERE id = 1
+        RETURNING version
+    """)).scalar()
+
+
+def init_rollup_table(conn):
+    init_data_version_table(conn)
+    conn.execute(text(f"""
+        CREATE TABLE IF NOT EXISTS {ROLLUP_TABLE} (
+            batch_id VARCHAR(64),
+            doc_year INTEGER NOT NULL,
+            doc_month INTEGER NOT NULL,
+            sales_team VARCHAR(120),
+            sales_rep_name VARCHAR(200),
+            province VARCHAR(120),
+            product_code VARCHAR(120),
+            product_group VARCHAR(120),
+            product_name VARCHAR(200),
+            customer_code VARCHAR(120),
+            customer_name VARCHAR(200),
+            total_amount NUMERIC NOT NULL DEFAULT 0,
+            total_quantity NUMERIC NOT NULL DEFAULT 0,
+            line_count INTEGER NOT NULL DEFAULT 0
+        )
+    """))
+    conn.execute(text(f"CREATE INDEX IF NOT EXISTS {ROLLUP_TABLE}_period_idx ON {ROLLUP_TABLE} (doc_year, doc_month)"))
+    conn.execute(text(f"CREATE INDEX IF NOT EXISTS {ROLLUP_TABLE}_batch_idx ON {ROLLUP_TABLE} (batch_id)"))
+
+
+# --- ตาราง dimension (ตัวเลือกใน dropdown) ---
+# /api/options และ /api/customer_options อ่านจากตารางเหล่านี้แทน SELECT DISTINCT ทั้งตาราง sales_transactions
+# เพิ่มค่าใหม่ตอน add_batch (อัปโหลด / เพิ่มรายการ) และลบค่าที่ไม่มีข้อมูลขายเหลือแล้วด้วย prune_dimensions (ตอนลบ batch)
+DIM_YEARS_TABLE = "dim_years"
+DIM_TEAMS_TABLE = "dim_teams"
+DIM_REPS_TABLE = "dim_reps"
+DIM_CUSTOMERS_TABLE = "dim_customers"
+
+_DIMENSION_INSERTS = [
+    f"""
+        INSERT INTO {DIM_YEARS_TABLE} (doc_year)
+        SELECT DISTINCT EXTRACT(YEAR FROM document_date)::int
+        FROM sales_transactions
+        WHERE document_date IS NOT NULL {{batch_condition}}
+        ON CONFLICT DO NOTHING
+    """,
+    f"""
+        INSERT INTO {DIM_TEAMS_TABLE} (sales_team)
+        SELECT DISTINCT sales_team
+        FROM sales_transactions
+        WHERE sales_team IS NOT NULL {{batch_condition}}
+        ON CONFLICT DO NOTHING
+    """,
+    f"""
+        INSERT INTO {DIM_REPS_TABLE} (sales_rep_name)
+        SELECT DISTINCT sales_rep_name
+        FROM sales_transactions
+        WHERE sales_rep_name IS NOT NULL {{batch_condition}}
+        ON CONFLICT DO NOTHING
+    """,
+    f"""
+        INSERT INTO {DIM_CUSTOMERS_TABLE} (customer_code, customer_name)
+        SELECT DISTINCT customer_code, customer_name
+        FROM sales_transactions
+        WHERE (customer_code IS NOT NULL OR customer_name IS NOT NULL) {{batch_condition}}
+        ON CONFLICT ((COALESCE(customer_code, '')), (COALESCE(customer_name, ''))) DO NOTHING
+    """
+]
+
+# NOT EXISTS แต่ละอันใช้ index ของ sales_transactions ได้ (document_date / sales_team / sales_rep_name / customer_code / customer_name)
+_DIMENSION_PRUNES = [
+    f"""
+        DELETE FROM {DIM_YEARS_TABLE} d
+        WHERE NOT EXISTS (
+            SELECT 1 FROM sales_transactions t
+            WHERE t.document_date >= make_date(d.doc_year, 1, 1)
+              AND t.document_date < make_date(d.doc_year + 1, 1, 1)
+        )
+    """,
+    f"""
+        DELETE FROM {DIM_TEAMS_TABLE} d
+        WHERE NOT EXISTS (SELECT 1 FROM sales_transactions t WHERE t.sales_team = d.sales_team)
+    """,
+    f"""
+        DELETE FROM {DIM_REPS_TABLE} d
+        WHERE NOT EXISTS (SELECT 1 FROM sales_transactions t WHERE t.sales_rep_name = d.sales_rep_name)
+    """,
+    f"""
+        DELETE FROM {DIM_CUSTOMERS_TABLE} d
+        WHERE NOT EXISTS (
+            SELECT 1 FROM sales_transactions t
+            WHERE t.customer_code = d.customer_code
+              AND t.customer_name IS NOT DISTINCT FROM d.customer_name
+        )
+        AND NOT EXISTS (
+            SELECT 1 FROM sales_transactions t
+            WHERE d.customer_code IS NULL
+              AND t.customer_code IS NULL
+              AND t.customer_name = d.customer_name
+        )
+    """
+]
+
+
+def init_dimension_tables(conn):
+    conn.execute(text(f"CREATE TABLE IF NOT EXISTS {DIM_YEARS_TABLE} (doc_year INTEGER PRIMARY KEY)"))
+    conn.execute(text(f"CREATE TABLE IF NOT EXISTS {DIM_TEAMS_TABLE} (sales_team VARCHAR(120) PRIMARY KEY)"))
+    conn.execute(text(f"CREATE TABLE IF NOT EXISTS {DIM_REPS_TABLE} (sales_rep_name VARCHAR(200) PRIMARY KEY)"))
+    conn.execute(text(f"""
+        CREATE TABLE IF NOT EXISTS {DIM_CUSTOMERS_TABLE} (
+            customer_code VARCHAR(120),
+            customer_name VARCHAR(200)
+        )
+    """))
+    conn.execute(text(f"""
+        CREATE UNIQUE INDEX IF NOT EXISTS {DIM_CUSTOMERS_TABLE}_key_idx
+        ON {DIM_CUSTOMERS_TABLE} ((COALESCE(customer_code, '')), (COALESCE(customer_name, '')))
+    """))
+
+
+def add_dimensions(conn, batch_id):
+    condition, params = _batch_condition(batch_id)
+    for sql in _DIMENSION_INSERTS:
+        conn.execute(text(sql.format(batch_condition=f"AND {condition}")), params)
+
+
+def prune_dimensions(conn):
+    # เรียกหลังลบข้อมูลขายออกจาก sales_transactions แล้ว
+    pruned = sum(conn.execute(text(sql)).rowcount for sql in _DIMENSION_PRUNES)
+    bump_data_version(conn)
+    return pruned
+
+
+def rebuild_dimensions(conn):
+    for table in (DIM_YEARS_TABLE, DIM_TEAMS_TABLE, DIM_REPS_TABLE, DIM_CUSTOMERS_TABLE):
+        conn.execute(text(f"DELETE FROM {table}"))
+    for sql in _DIMENSION_INSERTS:
+        conn.execute(text(sql.format(batch_condition="")))
+    bump_data_version(conn)
+
+
+def dimensions_empty(conn):
+    return conn.execute(text(f"SELECT 1 FROM {DIM_YEARS_TABLE} LIMIT 1")).fetchone() is None
+
+
+def _batch_condition(batch_id):
+    # batch_id = None คือข้อมูลเก่าที่นำเข้าโดยไม่มี batch (เช่นจาก fix_etl.py)
+    if batch_id is None:
+        return "batch_id IS NULL", {}
+    return "batch_id = :batch_id", {"batch_id": batch_id}
+
+
+def remove_batch(conn, batch_id):
+    # add_batch เรียกผ่านฟังก์ชันนี้ด้วย -> เพิ่มเวอร์ชันข้อมูลทั้งตอนเพิ่มและลบ batch
+    condition, params = _batch_condition(batch_id)
+    removed = conn.execute(text(f"DELETE FROM {ROLLUP_TABLE} WHERE {condition}"), params).rowcount
+    bump_data_version(conn)
+    return removed
+
+
+def add_batch(conn, batch_id):
+    # ลบของเดิมก่อนเสมอ เรียกซ้ำกี่ครั้งก็ได้ผลเหมือนเดิม
+    remove_batch(conn, batch_id)
+    condition, params = _batch_condition(batch_id)
+    sql = _ROLLUP_INSERT + _ROLLUP_SELECT.format(batch_condition=f"AND {condition}")
+    rows = conn.execute(text(sql), params).rowcount
+    add_dimensions(conn, batch_id)
+    return rows
+
+
+def rebuild(conn):
+    conn.execute(text(f"DELETE FROM {ROLLUP_TABLE}"))
+    sql = _ROLLUP_INSERT + _ROLLUP_SELECT.format(batch_condition="")
+    rows = conn.execute(text(sql)).rowcount
+    rebuild_dimensions(conn)
+    return rows
+
+
+def is_empty(conn):
+    return conn.execute(text(f"SELECT 1 FROM {ROLLUP_TABLE} LIMIT 1")).fetchone() is None
+
+
+def check(conn):
+    # เทียบยอดรวมราย batch/ปี/เดือน ระหว่างตารางจริงกับ rollup คืนรายการที่ไม่ตรงกัน
+    sql = f"""
+        WITH source AS (
+            SELECT
+                batch_id,
+                EXTRACT(YEAR FROM document_date)::int AS doc_year,
+                EXTRACT(MONTH FROM document_date)::int AS doc_month,
+                COALESCE(SUM(total_amount_non_vat), 0) AS total_amount,
+                COALESCE(SUM(quantity), 0) AS total_quantity,
+                COUNT(*) AS line_count
+            FROM sales_transactions
+            WHERE document_date IS NOT NULL
+            GROUP BY batch_id, doc_year, doc_month
+        ),
+        rollup AS (
+            SELECT
+                batch_id, doc_year, doc_month,
+                SUM(total_amount) AS total_amount,
+                SUM(total_quantity) AS total_quantity,
+                SUM(line_count) AS line_count
+            FROM {ROLLUP_TABLE}
+            GROUP BY batch_id, doc_year, doc_month
+        )
+        SELECT
+            COALESCE(s.batch_id, r.batch_id) AS batch_id,
+            COALESCE(s.doc_year, r.doc_year) AS doc_year,
+            COALESCE(s.doc_month, r.doc_month) AS doc_month,
+            s.total_amount, r.total_amount,
+            s.line_count, r.line_count
+        FROM source s
+        FULL OUTER JOIN rollup r
+            ON s.batch_id IS NOT DISTINCT FROM r.batch_id
+           AND s.doc_year = r.doc_year
+           AND s.doc_month = r.doc_month
+        WHERE s.total_amount IS DISTINCT FROM r.total_amount
+           OR s.total_quantity IS DISTINCT FROM r.total_quantity
+           OR s.line_count IS DISTINCT FROM r.line_count
+        ORDER BY 2, 3, 1
+    """
+    rows = conn.execute(text(sql)).fetchall()
+    return [
+        {
+            "batch_id": row[0],
+            "year": row[1],
+            "month": row[2],
+            "source_amount": float(row[3]) if row[3] is not None else None,
+            "rollup_amount": float(row[4]) if row[4] is not None else None,
+            "source_lines": int(row[5]) if row[5] is not None else None,
+            "rollup_lines": int(row[6]) if row[6] is not None else None
+        }
+        for row in rows
+    ]
+
+
+# ใช้งาน: python aggregates.py check | rebuild
+if __name__ == "__main__":
+    from db import get_engine
+
+    engine = get_engine()
+    command = sys.argv[1] if len(sys.argv) > 1 else "check"
+    if command == "rebuild":
+        with engine.begin() as conn:
+            init_rollup_table(conn)
+            init_dimension_tables(conn)
+            rows = rebuild(conn)
+        print(f"✅ สร้าง {ROLLUP_TABLE} ใหม่สำเร็จ {rows} แถว")
+    elif command == "check":
+        with engine.connect() as conn:
+            mismatches = check(conn)
+        if not mismatches:
+            print(f"✅ {ROLLUP_TABLE} ตรงกับ sales_transactions")
+        else:
+            print(f"❌ พบ {len(mismatches)} ช่วงที่ไม่ตรงกัน (รัน 'python aggregates.py rebuild' เพื่อสร้างใหม่)")
+            for item in mismatches:
+                print(f"   {item}")
+            sys.exit(1)
+    else:
+        print("ใช้งาน: python aggregates.py check | rebuild")
+        sys.exit(2)
@@ -0,0 +1,109 @@
+import argparse
+import os
+import re
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from etl_engine import split_customer_code_name, normalize_customer_code_series
+
+# เทียบความเร็ว + ผลลัพธ์ ระหว่างการแยก/ปรับรหัสลูกค้าแบบเดิม (ทีละแถว) กับแบบ vectorized
+# ใช้งาน: python benchmarks/bench_customer_cleaning.py --rows 500000 --customers 5000
+
+
+# --- แบบเดิม (ทีละแถว) คัดลอกมาจาก etl_engine / main.py ก่อนเปลี่ยน ---
+def legacy_split(series):
+    def _split_customer_code_name(value):
+        if pd.isna(value):
+            return None, None
+        text_value = str(value).strip()
+        if not text_value:
+            return None, None
+        if ':' in text_value:
+            code, name = text_value.split(':', 1)
+            return code.strip() or None, name.strip() or None
+        return None, text_value
+
+    extracted = series.apply(_split_customer_code_name)
+    return extracted.map(lambda x: x[0]), extracted.map(lambda x: x[1])
+
+
+def legacy_normalize(series):
+    def normalize_customer_code(value):
+        if value is None:
+            return None
+        text_value = str(value).strip()
+        if re.fullmatch(r"\d+\.0", text_value):
+            return text_value[:-2]
+        return text_value
+
+    # แบบเดิมแปลง NaN เป็นข้อความ "nan" (บั๊ก) แบบใหม่คืน None -> เทียบเฉพาะแถวที่มีค่า
+    return series.apply(lambda v: None if pd.isna(v) else normalize_customer_code(v))
+
+
+def make_frame(rows, customers, seed=42):
+    # ข้อมูลขายจริง 1 ลูกค้ามีหลายบรรทัด -> สุ่มบรรทัดจากกลุ่มลูกค้าจำนวน customers ราย
+    rng = np.random.default_rng(seed)
+    pool_name = []
+    pool_code = []
+    for idx in range(customers):
+        code = 10000 + idx
+        kind = idx % 6
+        if kind == 0:
+            pool_name.append(f"{code}:ร้านค้า {code}")
+        elif kind == 1:
+            pool_name.append(f"  {code} :  บริษัท {code} จำกัด  ")
+        elif kind == 2:
+            pool_name.append(f"ร้าน {code}")
+        elif kind == 3:
+            pool_name.append(None)
+        elif kind == 4:
+            pool_name.append("   ")
+        else:
+            pool_name.append(f":ไม่มีรหัส {code}")
+        pool_code.append(float(code) if kind % 2 == 0 else f" C{code} ")
+
+    # ค่าขอบที่ต้องให้ผลเหมือนเดิม
+    pool_name += ["A:B:C", " : ", "ร้าน:", None]
+    pool_code += ["  ", "12.0.0", "๑๒๓.0", ".0"]
+
+    picks = rng.integers(0, len(pool_name), size=rows)
+    return pd.DataFrame({
+        "customer_code_name": pd.Series(pool_name, dtype=object).take(picks).reset_index(drop=True),
+        "customer_code": pd.Series(pool_code, dtype=object).take(picks).reset_index(drop=True)
+    })
+
+
+def _timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--customers", type=int, default=5_000)
+    args = parser.parse_args()
+
+    df = make_frame(args.rows, args.customers)
+    print(f"rows: {len(df):,} | customers: {args.customers:,}")
+
+    (old_code, old_name), old_split_s = _timed(legacy_split, df["customer_code_name"])
+    (new_code, new_name), new_split_s = _timed(split_customer_code_name, df["customer_code_name"])
+    assert old_code.equals(new_code), "customer_code ไม่ตรงกัน"
+    assert old_name.equals(new_name), "customer_name ไม่ตรงกัน"
+    print(f"split customer_code_name : legacy {old_split_s:.3f}s | vectorized {new_split_s:.3f}s | x{old_split_s / new_split_s:.1f}")
+
+    old_norm, old_norm_s = _timed(legacy_normalize, df["customer_code"])
+    new_norm, new_norm_s = _timed(normalize_customer_code_series, df["customer_code"])
+    assert old_norm.equals(new_norm), "normalize_customer_code ไม่ตรงกัน"
+    print(f"normalize customer_code  : legacy {old_norm_s:.3f}s | vectorized {new_norm_s:.3f}s | x{old_norm_s / new_norm_s:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+import uuid
+from datetime import date
+from http.cookiejar import CookieJar
+from urllib.parse import urlencode
+from urllib.request import HTTPCookieProcessor, Request, build_opener
+
+from synthetic_data import build_workbook
+
+# Load test: วัด latency ของ /api/dashboard ช่วงปกติ เทียบกับช่วงที่มีการอัปโหลด Excel พร้อมกันหลายไฟล์
+# ต้องเปิด server ไว้ก่อน (ควรเป็นฐานข้อมูลทดสอบ) และปิด cache เพื่อวัดเวลา query จริง เช่น
+#   RESPONSE_CACHE_TTL_SECONDS=0 uvicorn main:app --workers 1
+#   python benchmarks/load_dashboard_during_upload.py --uploads 3 --rows 50000
+# จบแล้วจะลบ batch ที่อัปโหลดออกให้ (ผ่าน DELETE /api/update_history/{batch_id})
+
+
+class Client:
+    def __init__(self, base_url, timeout):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.opener = build_opener(HTTPCookieProcessor(CookieJar()))
+
+    def request(self, method, path, body=None, headers=None):
+        req = Request(self.base_url + path, data=body, method=method, headers=headers or {})
+        with self.opener.open(req, timeout=self.timeout) as resp:
+            return json.loads(resp.read() or b"null")
+
+    def login(self, username, password):
+        body = json.dumps({"username": username, "password": password}).encode()
+        return self.request("POST", "/api/login", body, {"Content-Type": "application/json"})
+
+    def upload(self, filename, content):
+        boundary = uuid.uuid4().hex
+        body = b"".join([
+            f"--{boundary}\r\n".encode(),
+            f'Content-Disposition: form-data; name="file"; filename="{filename}"\r\n'.encode(),
+            b"Content-Type: application/vnd.openxmlformats-officedocument.spreadsheetml.sheet\r\n\r\n",
+            content,
+            f"\r\n--{boundary}--\r\n".encode()
+        ])
+        return self.request("POST", "/api/upload_excel", body, {"Content-Type": f"multipart/form-data; boundary={boundary}"})
+
+
+def percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def summarize(latencies, errors):
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 1) if latencies else None,
+        "p95_ms": round(percentile(latencies, 95) * 1000, 1) if latencies else None,
+        "p99_ms": round(percentile(latencies, 99) * 1000, 1) if latencies else None,
+        "max_ms": round(max(latencies) * 1000, 1) if latencies else None
+    }
+
+
+def hammer_dashboard(args, stop_event):
+    # ยิง /api/dashboard วนไปเรื่อยๆ จาก args.concurrency thread จนกว่า stop_event จะถูก set
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    months = ["All"] + [str(m) for m in range(1, 13)]
+
+    def worker(seed):
+        client = Client(args.base_url, args.timeout)
+        client.login(args.username, args.password)
+        rng = random.Random(seed)
+        while not stop_event.is_set():
+            query = urlencode({"year": args.year, "month": rng.choice(months)})
+            start = time.perf_counter()
+            try:
+                client.request("GET", f"/api/dashboard?{query}")
+            except Exception:
+                with lock:
+                    errors[0] += 1
+                continue
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies.append(elapsed)
+
+    threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(args.concurrency)]
+    for t in threads:
+        t.start()
+    return threads, latencies, errors
+
+
+def run_phase(args, seconds, during=None):
+    stop_event = threading.Event()
+    threads, latencies, errors = hammer_dashboard(args, stop_event)
+    started = time.perf_counter()
+    result = during() if during else None
+    remaining = seconds - (time.perf_counter() - started)
+    if remaining > 0:
+        time.sleep(remaining)
+    stop_event.set()
+    for t in threads:
+        t.join()
+    return summarize(latencies, errors[0]), result
+
+
+def upload_and_wait(client, index, workbooks):
+    response = client.upload(f"loadtest_{index}.xlsx", workbooks[index])
+    job_id = response.get("job_id")
+    batch_id = response.get("batch_id")
+    while job_id:
+        job = client.request("GET", f"/api/ingest_jobs/{job_id}")
+        if job.get("status") in ("done", "failed"):
+            return {"batch_id": batch_id, "status": job.get("status"), "error": job.get("error")}
+        time.sleep(0.5)
+    return {"batch_id": batch_id, "status": "duplicate" if response.get("duplicate") else "unknown"}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="dashboard p99 latency during concurrent Excel uploads")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--username", default="admin")
+    parser.add_argument("--password", default="admin123")
+    parser.add_argument("--year", type=int, default=date.today().year)
+    parser.add_argument("--concurrency", type=int, default=8, help="จำนวน thread ที่ยิง dashboard")
+    parser.add_argument("--uploads", type=int, default=3, help="จำนวนไฟล์ที่อัปโหลดพร้อมกัน")
+    parser.add_argument("--rows", type=int, default=50000, help="จำนวนแถวต่อไฟล์")
+    parser.add_argument("--baseline-seconds", type=float, default=20)
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("--max-ratio", type=float, default=2.0, help="p99 ช่วงอัปโหลด / p99 ปกติ ที่ยอมรับได้")
+    parser.add_argument("--keep", action="store_true", help="ไม่ลบ batch ที่อัปโหลดหลังจบ")
+    args = parser.parse_args()
+
+    admin = Client(args.base_url, args.timeout)
+    admin.login(args.username, args.password)
+
+    print(f"สร้างไฟล์ทดสอบ {args.uploads} ไฟล์ x {args.rows} แถว ...")
+    workbooks = [build_workbook(args.rows, args.year, seed) for seed in range(args.uploads)]
+
+    print(f"ช่วงปกติ {args.baseline_seconds:.0f}s ...")
+    baseline, _ = run_phase(args, args.baseline_seconds)
+
+    def uploads():
+        results = [None] * args.uploads
+
+        def run(index):
+            client = Client(args.base_url, args.timeout)
+            client.login(args.username, args.password)
+            results[index] = upload_and_wait(client, index, workbooks)
+
+        threads = [threading.Thread(target=run, args=(i,)) for i in range(args.uploads)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return results
+
+    print("ช่วงอัปโหลดพร้อมกัน ...")
+    during, upload_results = run_phase(args, args.baseline_seconds, during=uploads)
+
+    if not args.keep:
+        for item in upload_results:
+            if item and item.get("batch_id") and item.get("status") == "done":
+                admin.request("DELETE", f"/api/update_history/{item['batch_id']}")
+
+    ratio = None
+    if baseline["p99_ms"] and during["p99_ms"]:
+        ratio = round(during["p99_ms"] / baseline["p99_ms"], 2)
+    report = {"baseline": baseline, "during_upload": during, "uploads": upload_results, "p99_ratio": ratio}
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+
+    if ratio is None or ratio > args.max_ratio:
+        print(f"❌ p99 ช่วงอัปโหลดสูงกว่าช่วงปกติเกิน {args.max_ratio}x")
+        sys.exit(1)
+    print(f"✅ p99 ช่วงอัปโหลด {ratio}x ของช่วงปกติ")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,331 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+from datetime import date, datetime
+from pathlib import Path
+from urllib.parse import urlencode
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from synthetic_data import (
+    CUSTOMER_SUMMARY_TEMPLATE_COLUMNS, LAYOUTS, PROVINCES, PROVINCES_BY_REGION, TEMPLATE_COLUMNS, iter_workbooks
+)
+
+# Benchmark: สร้างข้อมูลขายสังเคราะห์ตามขนาดที่กำหนด -> โหลดผ่าน process_excel_bytes -> จับเวลาทุก GET API ใน main.py
+# ผลลัพธ์เป็น JSON (ใช้เทียบกับรอบก่อนด้วย --baseline) ต้องใช้ PostgreSQL สำหรับทดสอบ (main.py สร้างตาราง/partition ตอน import)
+# ⚠️ ล้างข้อมูลขาย + ตารางสรุป + update_history ทุกครั้งที่เปลี่ยนขนาด -> ชื่อฐานข้อมูลต้องมีคำว่า "bench" (หรือใส่ --force)
+# ใช้งาน:
+#   createdb sales_bench
+#   python benchmarks/run_benchmarks.py --database-url postgresql://postgres:pw@localhost/sales_bench \
+#       --sizes 10000,100000,1000000 --output bench_results.json
+#   python benchmarks/run_benchmarks.py ... --output new.json --baseline bench_results.json --threshold 20
+# 10M แถว: --sizes 10000000 (แบ่งเป็นหลายไฟล์ตาม --file-rows เพราะ 1 sheet มีได้ไม่เกิน ~1M แถว)
+
+# parameter ตัวอย่างเพิ่มเติม (นอกจาก parameter บังคับ) สำหรับ route ที่รับ filter ของ dashboard
+FILTER_VARIANTS = [
+    {},
+    {"month": "6"},
+    {"region": "ภาคเหนือ"},
+    {"team": "A", "month": "3"}
+]
+ROUTE_VARIANTS = {
+    "/api/ranking": [{"n": 50, "dimensions": "product,customer,rep,team,product_group"}],
+    "/api/customer_search": [{"q": "0000"}],
+    "/api/customers": [{"search": "ลูกค้า 00"}],
+    "/api/employees": [{"search": "a"}]
+}
+
+
+def parse_sizes(value):
+    sizes = []
+    for part in value.split(","):
+        part = part.strip().lower().replace("_", "")
+        if not part:
+            continue
+        multiplier = 1
+        if part.endswith("k"):
+            multiplier, part = 1_000, part[:-1]
+        elif part.endswith("m"):
+            multiplier, part = 1_000_000, part[:-1]
+        sizes.append(int(float(part) * multiplier))
+    return sorted(sizes)
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def summarize(latencies):
+    ms = [v * 1000 for v in latencies]
+    return {
+        "runs": len(ms),
+        "min_ms": round(min(ms), 2),
+        "median_ms": round(statistics.median(ms), 2),
+        "p95_ms": round(percentile(ms, 95), 2),
+        "max_ms": round(max(ms), 2),
+        "mean_ms": round(statistics.fmean(ms), 2)
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], cwd=ROOT, text=True, stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def check_layouts(main):
+    # ไฟล์สังเคราะห์ต้องตรงกับ template ปัจจุบันของ main.py
+    assert TEMPLATE_COLUMNS == main.TEMPLATE_COLUMNS, "TEMPLATE_COLUMNS ไม่ตรงกับ main.py"
+    assert CUSTOMER_SUMMARY_TEMPLATE_COLUMNS == main.CUSTOMER_SUMMARY_TEMPLATE_COLUMNS, "CUSTOMER_SUMMARY_TEMPLATE_COLUMNS ไม่ตรงกับ main.py"
+    assert PROVINCES_BY_REGION == main.PROVINCES_BY_REGION, "PROVINCES_BY_REGION ไม่ตรงกับ main.py"
+
+
+def reset_data(main):
+    from sqlalchemy import text
+    import aggregates
+
+    tables = [
+        "sales_transactions", aggregates.ROLLUP_TABLE, aggregates.DIM_YEARS_TABLE, aggregates.DIM_TEAMS_TABLE,
+        aggregates.DIM_REPS_TABLE, aggregates.DIM_CUSTOMERS_TABLE, "update_history"
+    ]
+    with main.engine.begin() as conn:
+        conn.execute(text(f"TRUNCATE {', '.join(tables)}"))
+    main.response_cache.bump_version()
+
+
+def load_size(main, rows, args, years):
+    # สร้างไฟล์ + นำเข้าทีละไฟล์ แยกเวลา generate (ไม่นับเป็นเวลาของระบบ) กับเวลา process_excel_bytes
+    from sqlalchemy import text
+    from etl_engine import process_excel_bytes
+
+    files = []
+    generate_seconds = 0.0
+    load_seconds = 0.0
+    started = time.perf_counter()
+    workbooks = iter_workbooks(
+        rows, args.file_rows, layout=args.layout, customers=args.customers, reps=args.reps,
+        products=args.products, provinces=PROVINCES[:args.provinces], years=years, seed=args.seed
+    )
+    for file_rows, content in workbooks:
+        generated_at = time.perf_counter()
+        generate_seconds += generated_at - started
+        batch_id = str(uuid.uuid4())
+        result = process_excel_bytes(content, batch_id=batch_id, engine=main.engine)
+        elapsed = time.perf_counter() - generated_at
+        load_seconds += elapsed
+        if not result.get("success"):
+            raise RuntimeError(f"นำเข้าไม่สำเร็จ: {result.get('error')}")
+        with main.engine.begin() as conn:
+            conn.execute(text("""
+                INSERT INTO update_history (batch_id, source, filename, rows_count, uploaded_by)
+                VALUES (:batch_id, 'excel', :filename, :rows_count, 'benchmark')
+            """), {"batch_id": batch_id, "filename": f"synthetic_{len(files)}.xlsx", "rows_count": result["rows"]})
+        files.append({
+            "rows": file_rows,
+            "bytes": len(content),
+            "rows_loaded": result["rows"],
+            "seconds": round(elapsed, 3)
+        })
+        print(f"   นำเข้า {file_rows:,} แถว {elapsed:.1f}s")
+        started = time.perf_counter()
+
+    with main.engine.connect() as conn:
+        conn.execution_options(isolation_level="AUTOCOMMIT").execute(text("ANALYZE"))
+    main.response_cache.bump_version()
+
+    return {
+        "files": files,
+        "generate_seconds": round(generate_seconds, 3),
+        "load_seconds": round(load_seconds, 3),
+        "rows_per_second": round(rows / load_seconds, 1) if load_seconds else None
+    }
+
+
+def benchmark_cases(main, sample):
+    # ทุก GET route ของ API: เติม parameter บังคับจาก sample, route ที่มี path parameter (เช่น job_id) ข้าม
+    from fastapi.routing import APIRoute
+
+    cases = []
+    skipped = []
+    for route in main.app.routes:
+        if not isinstance(route, APIRoute) or "GET" not in route.methods:
+            continue
+        if not (route.path.startswith("/api/") or route.path == "/metrics"):
+            continue
+        if "{" in route.path:
+            skipped.append({"route": route.path, "reason": "path parameter"})
+            continue
+
+        accepted = {param.name for param in route.dependant.query_params}
+        required = [param.name for param in route.dependant.query_params if param.required]
+        missing = [name for name in required if name not in sample]
+        if missing:
+            skipped.append({"route": route.path, "reason": f"ไม่มีค่าตัวอย่างของ {', '.join(missing)}"})
+            continue
+
+        base = {name: sample[name] for name in required}
+        variants = FILTER_VARIANTS if {"month", "region", "team"} <= accepted else [{}]
+        for variant in variants + ROUTE_VARIANTS.get(route.path, []):
+            params = dict(base, **variant)
+            cases.append((route.path, params))
+    return cases, skipped
+
+
+def _statement_count(route_path):
+    import metrics
+
+    _, counters, _ = metrics.snapshot()
+    return sum(
+        value for key, value in counters.get("db_statements_total", {}).items()
+        if dict(key).get("route") == route_path
+    )
+
+
+def time_endpoints(client, main, sample, repeat):
+    cases, skipped = benchmark_cases(main, sample)
+    results = {}
+    for route_path, params in cases:
+        url = route_path + (f"?{urlencode(params)}" if params else "")
+        response = client.get(url)  # warm-up (plan cache / connection)
+        latencies = []
+        statements_before = _statement_count(route_path)
+        for _ in range(repeat):
+            start = time.perf_counter()
+            response = client.get(url)
+            latencies.append(time.perf_counter() - start)
+        entry = summarize(latencies)
+        entry.update({
+            "status": response.status_code,
+            "response_bytes": len(response.content),
+            "sql_statements_per_request": round((_statement_count(route_path) - statements_before) / repeat, 2)
+        })
+        results[f"GET {url}"] = entry
+        print(f"   {entry['median_ms']:>9.1f} ms  {response.status_code}  GET {url}")
+    return results, skipped
+
+
+def compare(baseline, current, threshold):
+    # เทียบ median ของ endpoint เดียวกันที่ขนาดข้อมูลเดียวกัน คืนรายการที่ช้าลงเกิน threshold %
+    previous = {
+        (size["rows"], key): value["median_ms"]
+        for size in baseline.get("sizes", []) for key, value in size["endpoints"].items()
+    }
+    regressions = []
+    for size in current["sizes"]:
+        for key, value in size["endpoints"].items():
+            old = previous.get((size["rows"], key))
+            if not old:
+                continue
+            change = (value["median_ms"] - old) / old * 100
+            if change > threshold:
+                regressions.append({
+                    "rows": size["rows"], "endpoint": key,
+                    "baseline_ms": old, "current_ms": value["median_ms"], "change_pct": round(change, 1)
+                })
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="benchmark การนำเข้า + ทุก GET API ตามขนาดข้อมูล")
+    parser.add_argument("--database-url", default=os.getenv("BENCH_DATABASE_URL"), help="PostgreSQL สำหรับทดสอบ (หรือ BENCH_DATABASE_URL)")
+    parser.add_argument("--sizes", default="10k,100k,1m", help="จำนวนแถว เช่น 10k,100k,1m,10m")
+    parser.add_argument("--layout", choices=sorted(LAYOUTS), default="template")
+    parser.add_argument("--years", default=f"{date.today().year - 1},{date.today().year}")
+    parser.add_argument("--customers", type=int, default=5000)
+    parser.add_argument("--reps", type=int, default=60)
+    parser.add_argument("--products", type=int, default=800)
+    parser.add_argument("--provinces", type=int, default=len(PROVINCES), help="ใช้จังหวัดกี่จังหวัด (เรียงตามภาค)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--file-rows", type=int, default=500_000, help="แถวต่อไฟล์ตอนนำเข้า")
+    parser.add_argument("--repeat", type=int, default=5, help="จำนวนครั้งที่ยิงแต่ละ endpoint")
+    parser.add_argument("--with-cache", action="store_true", help="เปิด response cache (ค่าเริ่มต้นปิดเพื่อวัดเวลา query จริง)")
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--baseline", help="ผลรอบก่อน (JSON) สำหรับเทียบ")
+    parser.add_argument("--threshold", type=float, default=20.0, help="ช้าลงเกินกี่ %% ถือว่า regression")
+    parser.add_argument("--force", action="store_true", help="ยอมล้างข้อมูลในฐานข้อมูลที่ชื่อไม่มีคำว่า bench")
+    args = parser.parse_args()
+
+    if not args.database_url:
+        parser.error("ต้องระบุ --database-url หรือ BENCH_DATABASE_URL")
+
+    from sqlalchemy.engine import make_url
+
+    url = make_url(args.database_url)
+    if not url.drivername.startswith("postgresql"):
+        parser.error("main.py ใช้คำสั่งเฉพาะของ PostgreSQL (partition, pg_trgm, FILTER) -> ต้องใช้ PostgreSQL")
+    if "bench" not in (url.database or "") and not args.force:
+        parser.error(f"ฐานข้อมูล '{url.database}' ชื่อไม่มีคำว่า bench (benchmark จะล้างข้อมูลขาย) ใส่ --force ถ้าแน่ใจ")
+
+    # ต้องตั้งก่อน import main / db
+    os.environ["DATABASE_URL"] = args.database_url
+    os.environ.pop("ASYNC_DATABASE_URL", None)
+    if not args.with_cache:
+        os.environ["RESPONSE_CACHE_TTL_SECONDS"] = "0"
+
+    # main.py mount โฟลเดอร์ static แบบ relative path
+    os.chdir(ROOT)
+    from fastapi.testclient import TestClient
+    from sqlalchemy import text
+    import main as app_main
+
+    check_layouts(app_main)
+    years = sorted(int(y) for y in args.years.split(",") if y.strip())
+    sizes = parse_sizes(args.sizes)
+
+    with app_main.engine.connect() as conn:
+        server_version = conn.execute(text("SHOW server_version")).scalar()
+
+    report = {
+        "meta": {
+            "started_at": datetime.now().isoformat(timespec="seconds"),
+            "git_commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "postgresql": server_version,
+            "args": {k: v for k, v in vars(args).items() if k != "database_url"}
+        },
+        "sizes": []
+    }
+
+    with TestClient(app_main.app) as client:
+        login = client.post("/api/login", json={"username": "admin", "password": "admin123"})
+        login.raise_for_status()
+
+        for rows in sizes:
+            print(f"▶ {rows:,} แถว")
+            reset_data(app_main)
+            load = load_size(app_main, rows, args, years)
+            # customer ที่ซื้อบ่อยที่สุด (Zipf อันดับ 1) มีข้อมูลแน่นอน
+            sample = {"year": years[-1], "customer": "C000001", "q": "ลูกค้า 0000"}
+            endpoints, skipped = time_endpoints(client, app_main, sample, args.repeat)
+            report["sizes"].append({"rows": rows, "load": load, "endpoints": endpoints, "skipped": skipped})
+
+            # เขียนผลทุกครั้งที่จบแต่ละขนาด (ขนาดใหญ่ใช้เวลานาน ไม่ให้ผลหายถ้าหยุดกลางทาง)
+            with open(args.output, "w", encoding="utf-8") as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+
+    print(f"✅ บันทึกผล -> {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, report, args.threshold)
+        for item in regressions:
+            print(f"❌ {item['rows']:,} แถว {item['endpoint']}: {item['baseline_ms']} -> {item['current_ms']} ms (+{item['change_pct']}%)")
+        if regressions:
+            sys.exit(1)
+        print(f"✅ ไม่มี endpoint ที่ช้าลงเกิน {args.threshold:g}%")
+
+
+if __name__ == "__main__":
+    main()
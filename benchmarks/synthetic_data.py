@@ -0,0 +1,234 @@
+import argparse
+import bisect
+import itertools
+import random
+import uuid
+from datetime import date, timedelta
+from io import BytesIO
+
+from openpyxl import Workbook
+
+# สร้างไฟล์ขายสังเคราะห์ (ใช้กับ benchmark / load test) ตามรูปแบบ template ของระบบ
+#   layout "template"         = TEMPLATE_COLUMNS (ไฟล์ที่ดาวน์โหลดจาก /api/template)
+#   layout "customer_summary" = CUSTOMER_SUMMARY_TEMPLATE_COLUMNS (ไฟล์สรุปการซื้อของลูกค้า)
+# ข้อมูลใกล้ของจริง: 1 บิลมีหลายบรรทัด, ลูกค้า/สินค้ายอดนิยมถูกซื้อบ่อยกว่า (กระจายแบบ Zipf),
+# ลูกค้าแต่ละรายอยู่จังหวัดเดียวและมีพนักงานขายประจำ -> dashboard กรองตามภาค/ทีมได้ผลแบบของจริง
+# seed เดิม + ค่าเดิม = ข้อมูลเดิมทุกครั้ง (ยกเว้น invoice_prefix ที่ไม่ได้กำหนด)
+# ใช้งาน: python benchmarks/synthetic_data.py --rows 100000 --years 2024,2025 -o sales_100k.xlsx
+
+# ต้องตรงกับ main.py (import main ไม่ได้เพราะ main.py เชื่อมต่อฐานข้อมูลตอน import)
+TEMPLATE_COLUMNS = [
+    'วันที่/เดือน/ปี เอกสาร', 'เลขที่บิล', 'รหัสลูกค้า', 'ชื่อลูกค้า', 'จังหวัด',
+    'รหัสพนักงานขาย', 'ชื่อพนักงาน', 'ทีม', 'รหัสสินค้า', 'กลุ่มสินค้า', 'รายละเอียด',
+    'จำนวน', 'หน่วยนับ', '@', '%ส่วนลด', '%ลดท้ายบิล', 'หน่วยละ NON VAT', 'รวมเงิน NON VAT'
+]
+
+CUSTOMER_SUMMARY_TEMPLATE_COLUMNS = [
+    'วันที่เอกสาร', 'เดือน', 'ปี', 'เลขที่บิล', 'รหัสลูกค้า/ชื่อลูกค้า', 'รหัสลูกค้า',
+    'ชื่อลูกค้า', 'จังหวัด', 'รหัสพนักงานขาย', 'ชือพนักงาน', 'ทีม', 'รหัสสินค้า',
+    'กลุ่มสินค้า', 'รายละเอียด', 'แถม 24', 'จำนวน', 'หน่วยนับ', '@', '% ส่วนลด',
+    '% ลดท้ายบิล', 'หน่วยละ NON VAT', 'รวมเงิน NON VAT'
+]
+
+PROVINCES_BY_REGION = {
+    "ภาคเหนือ": [
+        "เชียงใหม่", "เชียงราย", "ลำพูน", "ลำปาง", "แพร่", "น่าน", "พะเยา", "แม่ฮ่องสอน",
+        "ตาก", "สุโขทัย", "พิษณุโลก", "พิจิตร", "เพชรบูรณ์", "อุตรดิตถ์", "กำแพงเพชร",
+        "นครสวรรค์", "อุทัยธานี"
+    ],
+    "ภาคตะวันออกเฉียงเหนือ": [
+        "นครราชสีมา", "บุรีรัมย์", "สุรินทร์", "ศรีสะเกษ", "อุบลราชธานี", "ยโสธร", "ชัยภูมิ",
+        "อำนาจเจริญ", "บึงกาฬ", "หนองบัวลำภู", "ขอนแก่น", "อุดรธานี", "เลย", "หนองคาย",
+        "มหาสารคาม", "ร้อยเอ็ด", "กาฬสินธุ์", "สกลนคร", "นครพนม", "มุกดาหาร"
+    ],
+    "ภาคกลาง": [
+        "กรุงเทพมหานคร", "นนทบุรี", "ปทุมธานี", "พระนครศรีอยุธยา", "อ่างทอง", "ลพบุรี",
+        "สิงห์บุรี", "ชัยนาท", "สระบุรี", "นครปฐม", "สมุทรสาคร", "สมุทรสงคราม",
+        "สมุทรปราการ", "สุพรรณบุรี"
+    ],
+    "ภาคตะวันออก": [
+        "ชลบุรี", "ระยอง", "จันทบุรี", "ตราด", "ฉะเชิงเทรา", "ปราจีนบุรี", "สระแก้ว", "นครนายก"
+    ],
+    "ภาคตะวันตก": [
+        "กาญจนบุรี", "ราชบุรี", "เพชรบุรี", "ประจวบคีรีขันธ์"
+    ],
+    "ภาคใต้": [
+        "ชุมพร", "ระนอง", "สุราษฎร์ธานี", "พังงา", "ภูเก็ต", "กระบี่", "นครศรีธรรมราช",
+        "ตรัง", "พัทลุง", "สตูล", "สงขลา", "ปัตตานี", "ยะลา", "นราธิวาส"
+    ]
+}
+PROVINCES = [p for region in PROVINCES_BY_REGION.values() for p in region]
+
+LAYOUTS = {
+    "template": TEMPLATE_COLUMNS,
+    "customer_summary": CUSTOMER_SUMMARY_TEMPLATE_COLUMNS
+}
+
+# แถวต่อ sheet ของ Excel มีได้ไม่เกิน 1,048,576 (รวมหัวตาราง)
+MAX_SHEET_ROWS = 1_048_575
+
+UNITS = ["ชิ้น", "กล่อง", "แพ็ค", "ขวด", "ลัง"]
+TEAMS = ["A", "B", "C", "D", "E"]
+
+
+def _zipf_cum_weights(count, exponent=1.1):
+    total = 0.0
+    cum = []
+    for rank in range(1, count + 1):
+        total += 1.0 / rank ** exponent
+        cum.append(total)
+    return cum
+
+
+class SalesGenerator:
+    # master data (ลูกค้า / พนักงานขาย / สินค้า) สร้างครั้งเดียวจาก seed แล้วสุ่มบรรทัดขายต่อเนื่องได้เรื่อยๆ
+    def __init__(self, customers=2000, reps=40, products=500, provinces=None, years=None, seed=42, invoice_prefix=None):
+        self.rng = random.Random(seed)
+        self.years = sorted(years or [date.today().year])
+        self.invoice_prefix = invoice_prefix if invoice_prefix is not None else uuid.uuid4().hex[:6].upper()
+        provinces = provinces or PROVINCES
+
+        self.reps = [
+            (f"S{i:03d}", f"พนักงาน {i:03d}", TEAMS[i % len(TEAMS)])
+            for i in range(1, reps + 1)
+        ]
+        self.customers = [
+            (f"C{i:06d}", f"ร้าน ลูกค้า {i:06d}", self.rng.choice(provinces), self.reps[i % reps])
+            for i in range(1, customers + 1)
+        ]
+        self.products = []
+        for i in range(1, products + 1):
+            price = round(self.rng.lognormvariate(4.5, 0.9), 2)
+            self.products.append((f"P{i:05d}", f"G{i % 25:02d}", f"สินค้า {i:05d}", self.rng.choice(UNITS), price))
+
+        self._customer_weights = _zipf_cum_weights(len(self.customers))
+        self._product_weights = _zipf_cum_weights(len(self.products))
+        self._invoice_seq = itertools.count(1)
+        self._day_starts = [(date(y, 1, 1), (date(y + 1, 1, 1) - date(y, 1, 1)).days) for y in self.years]
+
+    def _pick(self, items, cum_weights):
+        return items[bisect.bisect_left(cum_weights, self.rng.random() * cum_weights[-1])]
+
+    def iter_lines(self, rows):
+        # คืน dict ต่อบรรทัดขาย (ชื่อ field ตามคอลัมน์ในฐานข้อมูล) จนครบ rows บรรทัด
+        rng = self.rng
+        produced = 0
+        while produced < rows:
+            code, name, province, (rep_code, rep_name, team) = self._pick(self.customers, self._customer_weights)
+            start, days = self._day_starts[rng.randrange(len(self._day_starts))]
+            doc_date = start + timedelta(days=rng.randrange(days))
+            invoice_no = f"{self.invoice_prefix}{doc_date.year % 100:02d}{next(self._invoice_seq):08d}"
+            bill_discount = rng.choice((0, 0, 0, 0, 2, 5))
+            for _ in range(min(rng.randint(1, 8), rows - produced)):
+                product_code, group, product_name, unit, price = self._pick(self.products, self._product_weights)
+                quantity = rng.choice((1, 1, 2, 3, 5, 6, 10, 12, 24, 48))
+                discount = rng.choice((0, 0, 0, 5, 10))
+                net_price = round(price * (1 - discount / 100) * (1 - bill_discount / 100), 2)
+                yield {
+                    "document_date": doc_date,
+                    "invoice_no": invoice_no,
+                    "customer_code": code,
+                    "customer_name": name,
+                    "province": province,
+                    "sales_rep_code": rep_code,
+                    "sales_rep_name": rep_name,
+                    "sales_team": team,
+                    "product_code": product_code,
+                    "product_group": group,
+                    "product_name": product_name,
+                    "quantity": quantity,
+                    "unit_of_measure": unit,
+                    "unit_price": price,
+                    "discount_percent": discount,
+                    "bill_discount_percent": bill_discount,
+                    "unit_price_non_vat": net_price,
+                    "total_amount_non_vat": round(net_price * quantity, 2)
+                }
+                produced += 1
+
+
+def _template_row(line):
+    return [
+        line["document_date"], line["invoice_no"], line["customer_code"], line["customer_name"], line["province"],
+        line["sales_rep_code"], line["sales_rep_name"], line["sales_team"], line["product_code"],
+        line["product_group"], line["product_name"], line["quantity"], line["unit_of_measure"],
+        line["unit_price"], line["discount_percent"], line["bill_discount_percent"],
+        line["unit_price_non_vat"], line["total_amount_non_vat"]
+    ]
+
+
+def _customer_summary_row(line):
+    doc_date = line["document_date"]
+    return [
+        doc_date, doc_date.month, doc_date.year, line["invoice_no"],
+        f"{line['customer_code']}:{line['customer_name']}", line["customer_code"], line["customer_name"],
+        line["province"], line["sales_rep_code"], line["sales_rep_name"], line["sales_team"],
+        line["product_code"], line["product_group"], line["product_name"], 0, line["quantity"],
+        line["unit_of_measure"], line["unit_price"], line["discount_percent"], line["bill_discount_percent"],
+        line["unit_price_non_vat"], line["total_amount_non_vat"]
+    ]
+
+
+_ROW_BUILDERS = {"template": _template_row, "customer_summary": _customer_summary_row}
+
+
+def write_workbook(generator, rows, layout="template", output=None):
+    # เขียนไฟล์แบบ write_only (ไม่ถือทั้ง sheet ในหน่วยความจำ) คืน bytes ถ้าไม่ระบุ output
+    if rows > MAX_SHEET_ROWS:
+        raise ValueError(f"1 sheet มีได้ไม่เกิน {MAX_SHEET_ROWS:,} แถว แบ่งเป็นหลายไฟล์แทน")
+    build_row = _ROW_BUILDERS[layout]
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Sheet1")
+    ws.append(LAYOUTS[layout])
+    for line in generator.iter_lines(rows):
+        ws.append(build_row(line))
+    target = output or BytesIO()
+    wb.save(target)
+    return target.getvalue() if output is None else output
+
+
+def build_workbook(rows, year, seed, layout="template", **options):
+    # ไฟล์เดียว ปีเดียว (เลขที่บิลสุ่ม prefix ใหม่ทุกครั้ง -> content hash ไม่ซ้ำกับรอบก่อน)
+    generator = SalesGenerator(years=[year], seed=seed, **options)
+    return write_workbook(generator, rows, layout=layout)
+
+
+def iter_workbooks(total_rows, file_rows, layout="template", **options):
+    # ข้อมูลเกิน 1 sheet -> แบ่งหลายไฟล์ (ใช้ master data ชุดเดียวกัน เลขที่บิลไม่ซ้ำข้ามไฟล์)
+    generator = SalesGenerator(**options)
+    remaining = total_rows
+    while remaining > 0:
+        rows = min(remaining, file_rows, MAX_SHEET_ROWS)
+        yield rows, write_workbook(generator, rows, layout=layout)
+        remaining -= rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="สร้างไฟล์ขาย Excel สังเคราะห์")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--layout", choices=sorted(LAYOUTS), default="template")
+    parser.add_argument("--years", default=str(date.today().year), help="เช่น 2024,2025")
+    parser.add_argument("--customers", type=int, default=2000)
+    parser.add_argument("--reps", type=int, default=40)
+    parser.add_argument("--products", type=int, default=500)
+    parser.add_argument("--provinces", type=int, default=len(PROVINCES), help="ใช้จังหวัดกี่จังหวัด (เรียงตามภาค)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("-o", "--output", default="synthetic_sales.xlsx")
+    args = parser.parse_args()
+
+    generator = SalesGenerator(
+        customers=args.customers,
+        reps=args.reps,
+        products=args.products,
+        provinces=PROVINCES[:args.provinces],
+        years=[int(y) for y in args.years.split(",") if y.strip()],
+        seed=args.seed,
+        invoice_prefix="SYN"
+    )
+    with open(args.output, "wb") as f:
+        write_workbook(generator, args.rows, layout=args.layout, output=f)
+    print(f"✅ เขียน {args.rows:,} แถว ({args.layout}) -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
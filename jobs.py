@@ -0,0 +1,109 @@
+import asyncio
+import functools
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+# --- งานเบื้องหลัง (background jobs) ---
+# เช่น นำเข้าไฟล์ Excel: endpoint ตอบ job_id กลับทันที แล้วให้ worker pool ทำงานต่อ
+# สถานะงานเก็บในหน่วยความจำของ process (หน้าเว็บ poll ดูความคืบหน้าผ่าน API)
+# นำเข้าไฟล์ (ingest) มี pool ของตัวเอง งานอื่นที่ใช้เวลานาน (ลบ batch / สร้างรายงาน) ใช้อีก pool
+# -> งานยาวๆ หลายงานพร้อมกันไม่ทำให้การอัปโหลดต้องรอคิว
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+BACKGROUND_JOB_WORKERS = int(os.getenv("BACKGROUND_JOB_WORKERS", "2"))
+MAX_FINISHED_JOBS = 200
+
+# งานหนักใน async endpoint (อ่าน/เขียนไฟล์อัปโหลด, pd.read_excel, bulk_load) ต้องไม่รันใน event loop
+# แยก pool ของตัวเองจาก threadpool ที่ Starlette ใช้รัน endpoint แบบ sync (dashboard)
+# อัปโหลดพร้อมกันหลายไฟล์จะต่อคิวกันใน pool นี้ ใช้ thread + connection ได้ไม่เกิน UPLOAD_CONCURRENCY
+UPLOAD_CONCURRENCY = int(os.getenv("UPLOAD_CONCURRENCY", "2"))
+
+_executor = ThreadPoolExecutor(max_workers=JOB_WORKERS, thread_name_prefix="job")
+_background_executor = ThreadPoolExecutor(max_workers=BACKGROUND_JOB_WORKERS, thread_name_prefix="background-job")
+INGEST_KINDS = ("ingest",)
+_upload_executor = ThreadPoolExecutor(max_workers=UPLOAD_CONCURRENCY, thread_name_prefix="upload")
+_jobs = {}
+_lock = threading.Lock()
+
+
+def _now():
+    return datetime.now().isoformat(timespec="seconds")
+
+
+def create_job(kind, **info):
+    job_id = uuid.uuid4().hex
+    job = {
+        "id": job_id,
+        "kind": kind,
+        "status": "queued",
+        "stage": "queued",
+        "rows_processed": 0,
+        "error": None,
+        "result": None,
+        "created_at": _now(),
+        "updated_at": _now(),
+        **info
+    }
+    with _lock:
+        _jobs[job_id] = job
+        _prune_finished()
+    return dict(job)
+
+
+def update_job(job_id, **fields):
+    with _lock:
+        job = _jobs.get(job_id)
+        if job is None:
+            return
+        job.update(fields)
+        job["updated_at"] = _now()
+
+
+def get_job(job_id):
+    with _lock:
+        job = _jobs.get(job_id)
+        return dict(job) if job else None
+
+
+def find_active(kind, **match):
+    # งานที่ยังไม่จบ (queued / running) ที่ตรงกับเงื่อนไข เช่น find_active("ingest", batch_id=...)
+    with _lock:
+        for job in _jobs.values():
+            if job["kind"] == kind and job["status"] in ("queued", "running") \
+                    and all(job.get(k) == v for k, v in match.items()):
+                return dict(job)
+    return None
+
+
+def submit(job_id, fn, *args, **kwargs):
+    # fn(job_id, ...) คืนค่าผลลัพธ์ของงาน ถ้า raise exception -> สถานะ failed พร้อมข้อความ error
+    def run():
+        update_job(job_id, status="running")
+        try:
+            result = fn(job_id, *args, **kwargs)
+        except Exception as e:
+            update_job(job_id, status="failed", stage="failed", error=str(e))
+        else:
+            update_job(job_id, status="done", stage="done", result=result)
+
+    job = get_job(job_id)
+    executor = _executor if job and job["kind"] in INGEST_KINDS else _background_executor
+    executor.submit(run)
+
+
+async def run_blocking(fn, *args, **kwargs):
+    # ใช้ใน async def: await jobs.run_blocking(fn, ...) -> รัน fn ใน upload pool แล้วรอผลโดยไม่บล็อก event loop
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_upload_executor, functools.partial(fn, *args, **kwargs))
+
+
+def _prune_finished():
+    # เก็บประวัติงานที่จบแล้วไว้แค่จำนวนหนึ่ง กันหน่วยความจำโตเรื่อยๆ
+    finished = [j for j in _jobs.values() if j["status"] in ("done", "failed")]
+    if len(finished) <= MAX_FINISHED_JOBS:
+        return
+    finished.sort(key=lambda j: j["updated_at"])
+    for job in finished[:len(finished) - MAX_FINISHED_JOBS]:
+        _jobs.pop(job["id"], None)
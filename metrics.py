@@ -0,0 +1,221 @@
+import contextvars
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+# --- วัดประสิทธิภาพ (เวลาต่อ endpoint, เวลา/จำนวนแถวต่อ SQL, เวลาแต่ละขั้นของ ETL) ---
+# เก็บในหน่วยความจำของ process แสดงผลแบบ Prometheus text format ที่ GET /metrics
+# SQL ที่ช้ากว่า SLOW_QUERY_MS มิลลิวินาที -> log (logger "dashboard.slow_query") พร้อม parameter ของ filter
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "500"))  # 0 = ไม่ log
+SLOW_QUERY_SQL_CHARS = 2000
+SLOW_QUERY_PARAM_CHARS = 200
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+slow_query_logger = logging.getLogger("dashboard.slow_query")
+
+# scope ของคำขอที่กำลังทำอยู่ (ใช้ทำ label route ของ SQL + ใส่ใน slow query log)
+# endpoint แบบ sync รันใน threadpool ที่ copy context มาด้วย, งานใน jobs.py ไม่มีคำขอ -> route="background"
+_current_scope = contextvars.ContextVar("current_scope", default=None)
+
+_lock = threading.Lock()
+_histograms = {}
+_counters = {}
+_help = {}
+
+
+def _label_key(labels):
+    return tuple(sorted(labels.items()))
+
+
+def _format_labels(labels, extra=None):
+    items = list(labels) + ([extra] if extra else [])
+    if not items:
+        return ""
+    parts = []
+    for key, value in items:
+        value = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        parts.append(f'{key}="{value}"')
+    return "{" + ",".join(parts) + "}"
+
+
+def observe(name, seconds, help_text="", **labels):
+    # เพิ่มค่าเข้า histogram (bucket ตาม LATENCY_BUCKETS)
+    key = _label_key(labels)
+    with _lock:
+        _help.setdefault(name, ("histogram", help_text))
+        series = _histograms.setdefault(name, {})
+        entry = series.get(key)
+        if entry is None:
+            entry = series[key] = {"buckets": [0] * len(LATENCY_BUCKETS), "sum": 0.0, "count": 0}
+        for idx, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                entry["buckets"][idx] += 1
+        entry["sum"] += seconds
+        entry["count"] += 1
+
+
+def inc(name, amount=1, help_text="", **labels):
+    key = _label_key(labels)
+    with _lock:
+        _help.setdefault(name, ("counter", help_text))
+        series = _counters.setdefault(name, {})
+        series[key] = series.get(key, 0) + amount
+
+
+def observe_stage(stage, seconds):
+    # เวลาขั้นตอนของ ETL (read / clean / load / rollup)
+    observe("etl_stage_seconds", seconds, "เวลาแต่ละขั้นตอนของการนำเข้าไฟล์ขาย", stage=stage)
+
+
+@contextmanager
+def stage_timer(stage):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe_stage(stage, time.perf_counter() - start)
+
+
+def snapshot():
+    with _lock:
+        histograms = {
+            name: {key: {"buckets": list(e["buckets"]), "sum": e["sum"], "count": e["count"]} for key, e in series.items()}
+            for name, series in _histograms.items()
+        }
+        counters = {name: dict(series) for name, series in _counters.items()}
+        help_map = dict(_help)
+    return histograms, counters, help_map
+
+
+def render(gauges=None):
+    # Prometheus text format 0.0.4
+    # gauges = {ชื่อ: (คำอธิบาย, ค่า)} ค่าปัจจุบันจากส่วนอื่นของแอป (pool, cache)
+    histograms, counters, help_map = snapshot()
+    lines = []
+    for name in sorted(counters):
+        lines.append(f"# HELP {name} {help_map[name][1]}")
+        lines.append(f"# TYPE {name} counter")
+        for key, value in sorted(counters[name].items()):
+            lines.append(f"{name}{_format_labels(key)} {value}")
+    for name in sorted(histograms):
+        lines.append(f"# HELP {name} {help_map[name][1]}")
+        lines.append(f"# TYPE {name} histogram")
+        for key, entry in sorted(histograms[name].items()):
+            for bound, count in zip(LATENCY_BUCKETS, entry["buckets"]):
+                lines.append(f"{name}_bucket{_format_labels(key, ('le', bound))} {count}")
+            lines.append(f"{name}_bucket{_format_labels(key, ('le', '+Inf'))} {entry['count']}")
+            lines.append(f"{name}_sum{_format_labels(key)} {entry['sum']:.6f}")
+            lines.append(f"{name}_count{_format_labels(key)} {entry['count']}")
+    for name, (help_text, value) in sorted((gauges or {}).items()):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} gauge")
+        lines.append(f"{name} {value}")
+    return "\n".join(lines) + "\n"
+
+
+# --- HTTP ---
+class MetricsMiddleware:
+    # ASGI middleware: เวลาตอบของแต่ละ route (ใช้ path template เช่น /api/jobs/{job_id} ไม่ใช่ URL จริง)
+    # นับจนส่ง response ครบ (รวม StreamingResponse)
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        token = _current_scope.set(scope)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            _current_scope.reset(token)
+            observe(
+                "http_request_duration_seconds", elapsed, "เวลาตอบคำขอ HTTP ต่อ route",
+                method=scope["method"], route=_route_label(scope), status=status["code"]
+            )
+
+
+def _route_label(scope):
+    # router ของ FastAPI ใส่ route ที่ match ไว้ใน scope
+    # ไม่ผ่าน route ของ API (ไฟล์ static / 404) -> รวมเป็นกลุ่มเดียว ไม่ให้ label แตกตาม URL
+    if scope is None:
+        return "background"
+    return getattr(scope.get("route"), "path", None) or "unmatched"
+
+
+# --- SQL ---
+def _operation(statement):
+    words = statement.lstrip().split(None, 1)
+    return words[0].upper() if words else "-"
+
+
+def _short_params(parameters):
+    # parameter ของ filter (ปี / เดือน / จังหวัด ...) ตัดค่าที่ยาวเกิน ไม่ให้ log บวม
+    if isinstance(parameters, (list, tuple)) and parameters and isinstance(parameters[0], (dict, list, tuple)):
+        return f"<executemany {len(parameters)} ชุด>"
+    if isinstance(parameters, dict):
+        return {k: _short_value(v) for k, v in parameters.items()}
+    return _short_value(parameters)
+
+
+def _short_value(value):
+    text_value = repr(value)
+    if len(text_value) > SLOW_QUERY_PARAM_CHARS:
+        return text_value[:SLOW_QUERY_PARAM_CHARS] + "..."
+    return value
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # เก็บเวลาเริ่มไว้ที่ execution context (คำสั่งที่ error ไม่ถึง after_cursor_execute ก็ไม่ค้าง)
+    if context is not None:
+        context._metrics_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = getattr(context, "_metrics_start", None)
+    if start is None:
+        return
+    elapsed = time.perf_counter() - start
+    scope = _current_scope.get()
+    labels = {"route": _route_label(scope), "operation": _operation(statement)}
+    observe("db_statement_duration_seconds", elapsed, "เวลาทำงานของคำสั่ง SQL ต่อ route", **labels)
+    inc("db_statements_total", 1, "จำนวนคำสั่ง SQL", **labels)
+    rowcount = getattr(cursor, "rowcount", -1)
+    if rowcount is not None and rowcount >= 0:
+        inc("db_statement_rows_total", rowcount, "จำนวนแถวที่คำสั่ง SQL อ่าน/แก้ไข", **labels)
+
+    if SLOW_QUERY_MS > 0 and elapsed * 1000 >= SLOW_QUERY_MS:
+        inc("db_slow_statements_total", 1, f"จำนวนคำสั่ง SQL ที่ใช้เวลาเกิน {SLOW_QUERY_MS:g} ms", **labels)
+        sql = " ".join(statement.split())
+        if len(sql) > SLOW_QUERY_SQL_CHARS:
+            sql = sql[:SLOW_QUERY_SQL_CHARS] + "..."
+        slow_query_logger.warning(
+            "slow query %.1f ms rows=%s request=%s params=%s sql=%s",
+            elapsed * 1000, rowcount,
+            f"{scope['method']} {scope['path']}" if scope else "background",
+            _short_params(parameters), sql
+        )
+
+
+def instrument_engine(engine):
+    # ติด event hook ให้ engine (async engine -> ส่ง async_engine.sync_engine)
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return engine
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    return engine
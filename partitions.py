@@ -0,0 +1,191 @@
+import os
+import re
+import sys
+
+from sqlalchemy import text
+
+import aggregates
+
+# --- แบ่ง partition ตาราง sales_transactions ตามปีของ document_date ---
+# sales_transactions เป็นตาราง partitioned (PARTITION BY RANGE (document_date)) มี partition ละ 1 ปี
+#   sales_transactions_y2024 = document_date ตั้งแต่ 2024-01-01 ถึงก่อน 2025-01-01
+#   sales_transactions_default = แถวที่ไม่มีวันที่ / ปีที่ยังไม่มี partition
+# query ที่กรองช่วงวันที่ (build_filter) จะอ่านเฉพาะ partition ของปีนั้น และเก็บถาวรปีเก่าได้ด้วยการ detach
+# ฐานข้อมูลเดิมที่เป็นตารางธรรมดา -> ย้ายด้วย: python partitions.py migrate
+PARENT_TABLE = "sales_transactions"
+DEFAULT_PARTITION = f"{PARENT_TABLE}_default"
+PARTITIONING_ENABLED = os.getenv("SALES_PARTITIONING", "1") != "0"
+
+# กันสอง process/thread สร้าง partition ปีเดียวกันพร้อมกัน
+_PARTITION_LOCK_KEY = "sales_transactions_partitions"
+
+
+def partition_name(year):
+    return f"{PARENT_TABLE}_y{int(year)}"
+
+
+def _year_bounds(year):
+    year = int(year)
+    return f"{year:04d}-01-01", f"{year + 1:04d}-01-01"
+
+
+def is_partitioned(conn):
+    return conn.execute(text("""
+        SELECT 1 FROM pg_partitioned_table
+        WHERE partrelid = to_regclass(:table)
+    """), {"table": PARENT_TABLE}).fetchone() is not None
+
+
+def list_partitions(conn):
+    rows = conn.execute(text("""
+        SELECT c.relname, pg_get_expr(c.relpartbound, c.oid), COALESCE(c.reltuples, 0)::bigint
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = to_regclass(:table)
+        ORDER BY c.relname
+    """), {"table": PARENT_TABLE}).fetchall()
+    return [{"name": row[0], "bound": row[1], "estimated_rows": max(int(row[2]), 0)} for row in rows]
+
+
+def ensure_default_partition(conn):
+    conn.execute(text(f"CREATE TABLE IF NOT EXISTS {DEFAULT_PARTITION} PARTITION OF {PARENT_TABLE} DEFAULT"))
+
+
+def _create_year_partition(conn, year):
+    name = partition_name(year)
+    start, end = _year_bounds(year)
+    in_default = conn.execute(text(f"""
+        SELECT 1 FROM {DEFAULT_PARTITION}
+        WHERE document_date >= :start AND document_date < :end
+        LIMIT 1
+    """), {"start": start, "end": end}).fetchone()
+
+    if not in_default:
+        conn.execute(text(f"""
+            CREATE TABLE IF NOT EXISTS {name} PARTITION OF {PARENT_TABLE}
+            FOR VALUES FROM ('{start}') TO ('{end}')
+        """))
+        return
+
+    # มีแถวของปีนี้ค้างอยู่ใน default partition -> สร้าง partition ไม่ได้ตรงๆ
+    # ย้ายแถวออกจาก default ไปตารางใหม่ก่อน แล้วค่อย attach
+    conn.execute(text(f"CREATE TABLE {name} (LIKE {PARENT_TABLE} INCLUDING DEFAULTS)"))
+    conn.execute(text(f"""
+        WITH moved AS (
+            DELETE FROM {DEFAULT_PARTITION}
+            WHERE document_date >= :start AND document_date < :end
+            RETURNING *
+        )
+        INSERT INTO {name} SELECT * FROM moved
+    """), {"start": start, "end": end})
+    conn.execute(text(f"ALTER TABLE {PARENT_TABLE} ATTACH PARTITION {name} FOR VALUES FROM ('{start}') TO ('{end}')"))
+
+
+def ensure_year_partitions(conn, years):
+    # เรียกก่อนเพิ่มข้อมูล (อัปโหลด / เพิ่มรายการ / fix_etl) ควรใช้ transaction สั้นๆ แยกจากการโหลดข้อมูล
+    # เพราะการสร้าง partition ต้อง lock ตารางแม่
+    # คืนรายชื่อ partition ที่สร้างใหม่ (ตารางที่ยังไม่ได้แบ่ง partition -> ไม่ทำอะไร)
+    years = sorted({int(y) for y in years if y is not None})
+    if not years or not is_partitioned(conn):
+        return []
+
+    existing = {p["name"] for p in list_partitions(conn)}
+    missing = [y for y in years if partition_name(y) not in existing]
+    if not missing:
+        return []
+
+    conn.execute(text("SELECT pg_advisory_xact_lock(hashtext(:key))"), {"key": _PARTITION_LOCK_KEY})
+    existing = {p["name"] for p in list_partitions(conn)}
+    created = []
+    for year in missing:
+        if partition_name(year) in existing:
+            continue
+        _create_year_partition(conn, year)
+        created.append(partition_name(year))
+    return created
+
+
+def detach_year(conn, year):
+    # เก็บถาวรข้อมูลปีเก่า: แยก partition ออกเป็นตารางธรรมดา (ข้อมูลยังอยู่ ไม่ต้อง DELETE ทีละแถว)
+    # แล้วเอายอดของปีนั้นออกจาก rollup / dimension ให้ dashboard ตรงกับข้อมูลที่เหลือ
+    name = partition_name(year)
+    if name not in {p["name"] for p in list_partitions(conn)}:
+        raise ValueError(f"ไม่พบ partition {name}")
+    conn.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name}"))
+    conn.execute(text(f"DELETE FROM {aggregates.ROLLUP_TABLE} WHERE doc_year = :year"), {"year": int(year)})
+    aggregates.prune_dimensions(conn)
+    return name
+
+
+def migrate(conn):
+    # ย้ายตาราง sales_transactions เดิม (ตารางธรรมดา) เป็นตาราง partitioned ใน transaction เดียว
+    # index เดิมถูกสร้างใหม่บนตารางแม่ (กระจายไปทุก partition อัตโนมัติ)
+    # คืนจำนวนแถวที่ย้าย (None = เป็น partitioned อยู่แล้ว)
+    if is_partitioned(conn):
+        return None
+
+    legacy = f"{PARENT_TABLE}_legacy"
+    conn.execute(text(f"LOCK TABLE {PARENT_TABLE} IN ACCESS EXCLUSIVE MODE"))
+    index_defs = [
+        row[0] for row in conn.execute(text("""
+            SELECT indexdef FROM pg_indexes
+            WHERE schemaname = current_schema() AND tablename = :table
+        """), {"table": PARENT_TABLE}).fetchall()
+    ]
+    years = [
+        int(row[0]) for row in conn.execute(text(f"""
+            SELECT DISTINCT EXTRACT(YEAR FROM document_date)::int
+            FROM {PARENT_TABLE}
+            WHERE document_date IS NOT NULL
+        """)).fetchall()
+    ]
+
+    conn.execute(text(f"ALTER TABLE {PARENT_TABLE} RENAME TO {legacy}"))
+    conn.execute(text(f"""
+        CREATE TABLE {PARENT_TABLE} (LIKE {legacy} INCLUDING DEFAULTS)
+        PARTITION BY RANGE (document_date)
+    """))
+    ensure_default_partition(conn)
+    for year in years:
+        _create_year_partition(conn, year)
+
+    moved = conn.execute(text(f"INSERT INTO {PARENT_TABLE} SELECT * FROM {legacy}")).rowcount
+    conn.execute(text(f"DROP TABLE {legacy}"))
+
+    # indexdef อ้างชื่อตารางเดิม (ตอนนั้นยังชื่อ sales_transactions) -> ใช้ได้ตรงๆ หลัง DROP ตาราง legacy
+    for index_def in index_defs:
+        conn.execute(text(re.sub(r"^CREATE (UNIQUE )?INDEX ", r"CREATE \1INDEX IF NOT EXISTS ", index_def)))
+    return moved
+
+
+# ใช้งาน: python partitions.py list | migrate | ensure <ปี> [<ปี> ...] | detach <ปี>
+if __name__ == "__main__":
+    from db import get_engine
+
+    engine = get_engine()
+    command = sys.argv[1] if len(sys.argv) > 1 else "list"
+    if command == "list":
+        with engine.connect() as conn:
+            if not is_partitioned(conn):
+                print(f"ℹ️ {PARENT_TABLE} ยังไม่ได้แบ่ง partition (รัน 'python partitions.py migrate')")
+                sys.exit(0)
+            for item in list_partitions(conn):
+                print(f"   {item['name']}: {item['bound']} (~{item['estimated_rows']} แถว)")
+    elif command == "migrate":
+        with engine.begin() as conn:
+            moved = migrate(conn)
+        if moved is None:
+            print(f"✅ {PARENT_TABLE} เป็นตาราง partitioned อยู่แล้ว")
+        else:
+            print(f"✅ ย้าย {PARENT_TABLE} เป็นตาราง partitioned สำเร็จ {moved} แถว")
+    elif command == "ensure" and len(sys.argv) > 2:
+        with engine.begin() as conn:
+            created = ensure_year_partitions(conn, sys.argv[2:])
+        print(f"✅ สร้าง partition ใหม่: {', '.join(created) if created else '-'}")
+    elif command == "detach" and len(sys.argv) == 3:
+        with engine.begin() as conn:
+            name = detach_year(conn, sys.argv[2])
+        print(f"✅ แยก {name} ออกจาก {PARENT_TABLE} แล้ว (ข้อมูลยังอยู่ในตาราง {name})")
+    else:
+        print("ใช้งาน: python partitions.py list | migrate | ensure <ปี> [<ปี> ...] | detach <ปี>")
+        sys.exit(2)
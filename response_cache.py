@@ -0,0 +1,100 @@
+import threading
+import time
+from collections import OrderedDict
+
+# --- Cache ผลลัพธ์ของ API dashboard (ในหน่วยความจำของ process) ---
+# key = ชื่อ API + SQL + parameter ที่ได้จาก build_filter
+# data_version จะถูกเพิ่มทุกครั้งที่ข้อมูลขายเปลี่ยน (อัปโหลด / เพิ่มรายการ / ลบ batch) และล้าง cache ทั้งหมด
+# การแก้ข้อมูลจากที่อื่น (process อื่น / สคริปต์) รู้ได้จาก sync_version(เวอร์ชันในฐานข้อมูล)
+
+
+class ResponseCache:
+    def __init__(self, max_entries=512, ttl_seconds=300):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.data_version = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.external_version = None
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(name, sql, params):
+        return (name, " ".join(str(sql).split()), tuple(sorted((k, repr(v)) for k, v in params.items())))
+
+    def _lookup(self, key):
+        # คืน (hit, value, version) ถ้าไม่เจอ version คือ data_version ตอนเริ่มคำนวณ
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return True, value, None
+                del self._entries[key]
+                self.evictions += 1
+            self.misses += 1
+            return False, None, self.data_version
+
+    def _store(self, key, version, value):
+        with self._lock:
+            # ข้อมูลเปลี่ยนระหว่างคำนวณ -> ไม่เก็บผลลัพธ์ที่อาจเก่าแล้ว
+            if version == self.data_version:
+                self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+
+    def get_or_compute(self, name, sql, params, compute):
+        key = self.make_key(name, sql, params)
+        hit, value, version = self._lookup(key)
+        if hit:
+            return value
+        value = compute()
+        self._store(key, version, value)
+        return value
+
+    async def get_or_compute_async(self, name, sql, params, compute):
+        # เหมือน get_or_compute แต่ compute เป็น coroutine function (ใช้กับ async engine)
+        key = self.make_key(name, sql, params)
+        hit, value, version = self._lookup(key)
+        if hit:
+            return value
+        value = await compute()
+        self._store(key, version, value)
+        return value
+
+    def bump_version(self):
+        with self._lock:
+            self.data_version += 1
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+            return self.data_version
+
+    def sync_version(self, external_version):
+        # เวอร์ชันข้อมูลในฐานข้อมูลเปลี่ยน (process อื่น / สคริปต์ที่รันนอกแอปแก้ข้อมูล) -> ล้าง cache
+        with self._lock:
+            if external_version == self.external_version:
+                return False
+            self.external_version = external_version
+        self.bump_version()
+        return True
+
+    def stats(self):
+        with self._lock:
+            return {
+                "data_version": self.data_version,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations
+            }
@@ -0,0 +1,101 @@
+import json
+import os
+import re
+from collections import namedtuple
+from functools import lru_cache
+from pathlib import Path
+
+# --- ทะเบียนการจับคู่ชื่อคอลัมน์ (หัวตาราง Excel -> ชื่อคอลัมน์ในฐานข้อมูล) ---
+# ตั้งค่าอยู่ใน column_mappings.json (หรือไฟล์ที่ระบุใน COLUMN_MAPPINGS_FILE) แยกตามชนิดไฟล์: sales / employees / customers
+#   aliases = ชื่อที่สะกด/เว้นวรรคไม่ตรง -> ชื่อหัวคอลัมน์มาตรฐาน
+#   columns = ชื่อหัวคอลัมน์ -> ชื่อคอลัมน์ในระบบ
+#   derived = คอลัมน์ที่ใช้ระหว่างทำความสะอาด ไม่ได้บันทึกลงตารางตรงๆ (เช่น customer_code_name)
+# เพิ่มรูปแบบไฟล์ export ใหม่ได้ด้วยการแก้ไฟล์ config ไม่ต้องแก้โค้ด
+# อ่านและ compile ครั้งเดียวตอน import ผลการจับคู่ของหัวตารางแต่ละชุดถูก cache ไว้ (ไฟล์รูปแบบเดิม / chunk ถัดไปไม่ต้องคำนวณซ้ำ)
+MAPPINGS_FILE = os.getenv("COLUMN_MAPPINGS_FILE", str(Path(__file__).with_name("column_mappings.json")))
+
+_WHITESPACE = re.compile(r"\s+")
+
+# positions/names = ตำแหน่งคอลัมน์ที่ใช้ + ชื่อในระบบ (ชื่อซ้ำเก็บเฉพาะคอลัมน์แรก), unmapped = หัวคอลัมน์ที่ไม่รู้จัก
+Resolution = namedtuple("Resolution", ["positions", "names", "unmapped"])
+
+
+def normalize_header(value):
+    # ตัดช่องว่างหน้า-หลัง + ลดช่องว่างซ้ำ
+    return _WHITESPACE.sub(" ", str(value).strip())
+
+
+class ColumnSchema:
+    def __init__(self, name, columns, aliases=None, derived=None, description=None):
+        self.name = name
+        self.description = description
+        self.targets = list(dict.fromkeys(columns.values()))
+        self.derived = list(derived or [])
+        self.db_columns = [c for c in self.targets if c not in self.derived]
+
+        # รวม aliases + columns เป็น lookup เดียว (key ผ่าน normalize_header แล้ว)
+        lookup = {target: target for target in self.targets}
+        lookup.update({normalize_header(k): v for k, v in columns.items()})
+        for alias, header in (aliases or {}).items():
+            header = normalize_header(header)
+            target = lookup.get(header)
+            if target is None:
+                raise ValueError(f"{name}: alias '{alias}' ชี้ไปที่ '{header}' ซึ่งไม่มีใน columns")
+            lookup[normalize_header(alias)] = target
+        self._lookup = lookup
+        self._resolve_cached = lru_cache(maxsize=256)(self._resolve)
+
+    def _resolve(self, headers):
+        positions, names, unmapped = [], [], []
+        seen = set()
+        for idx, header in enumerate(headers):
+            target = self._lookup.get(normalize_header(header))
+            if target is None:
+                if not str(header).startswith("Unnamed:"):
+                    unmapped.append(str(header))
+                continue
+            # ชื่อซ้ำหลังจับคู่ -> ใช้คอลัมน์แรก
+            if target in seen:
+                continue
+            seen.add(target)
+            positions.append(idx)
+            names.append(target)
+        return Resolution(tuple(positions), tuple(names), tuple(unmapped))
+
+    def resolve(self, headers):
+        return self._resolve_cached(tuple(str(h) for h in headers))
+
+    def apply(self, df):
+        # คืน (DataFrame ที่เหลือเฉพาะคอลัมน์ที่รู้จักและเปลี่ยนชื่อแล้ว, รายชื่อหัวคอลัมน์ที่ไม่รู้จัก)
+        resolution = self.resolve(df.columns)
+        result = df.iloc[:, list(resolution.positions)].copy()
+        result.columns = list(resolution.names)
+        return result, list(resolution.unmapped)
+
+    def cache_info(self):
+        return self._resolve_cached.cache_info()
+
+
+def load_registry(path=MAPPINGS_FILE):
+    with open(path, encoding="utf-8") as f:
+        config = json.load(f)
+    return {
+        name: ColumnSchema(
+            name,
+            spec["columns"],
+            aliases=spec.get("aliases"),
+            derived=spec.get("derived"),
+            description=spec.get("description")
+        )
+        for name, spec in config.items()
+    }
+
+
+REGISTRY = load_registry()
+
+
+def get_schema(name):
+    schema = REGISTRY.get(name)
+    if schema is None:
+        raise KeyError(f"ไม่พบ schema '{name}' ใน {MAPPINGS_FILE}")
+    return schema